@@ -10,6 +10,7 @@ from functions import get_index_trend
 from stockmarket import get_raw_stockmarket_data, get_yearly_stockmarket_trend
 from stockmarket import get_montly_stockmarket_trend, get_yearly_stockmarket_data_for_dashboard
 from inflation import get_cpi, get_inflation
+from profiling import profile, profiling_enabled
 
 st.set_page_config(layout='wide')
 
@@ -307,4 +308,6 @@ def main() -> None:
         st.plotly_chart(fig, use_container_width=True)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    page = st.session_state.get('page', 'start')
+    with profile(f"app-{page}", enabled=profiling_enabled(st.query_params)):
+        main()
\ No newline at end of file
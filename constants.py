@@ -1 +1,13 @@
-FEAR_GREED_INDEX_URL = "https://api.alternative.me/fng/?limit={limit}&format={format}"
\ No newline at end of file
+FEAR_GREED_INDEX_URL = "https://api.alternative.me/fng/?limit={limit}&format={format}"
+
+# Fear & Greed bands, same levels the dashboard draws on the F&G line chart.
+# A value on a band line belongs to the band above it (25 is Fear, 55 is Greed), as alternative.me does at those lines.
+SENTIMENT_BANDS = [0, 25, 45, 55, 75, 100]
+SENTIMENT_LABELS = ["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"]
+
+# Request budgets shared by every process on the host: upstream -> (requests, per seconds, burst)
+RATE_LIMITS = {
+    "alternative.me": (60, 60, 5),
+    "yahoo": (60, 60, 5),
+    "cpi": (120, 60, 10),
+}
@@ -4,6 +4,7 @@ import logging
 
 from typing import Union
 from functions import format_timedelta
+from ratelimit import rate_limit
 
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
@@ -32,6 +33,7 @@ def get_index(
     """
     url = url.format(limit=limit, format=format)
     try:
+        rate_limit("alternative.me")
         response = requests.get(url, timeout=timeout).json()
         raw = response['data']
         df = pd.DataFrame(raw)
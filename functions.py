@@ -3,8 +3,12 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.graph_objects import Figure
+import logging
 from typing import Union
 
+logging.basicConfig(level=logging.ERROR)
+logger = logging.getLogger(__name__)
+
 def format_timedelta(td_series: pd.Series) -> str:
     """Convert timedelta to readable format '00 hours and 00 minutes'"""
     data = td_series.iloc[0]
@@ -181,6 +185,20 @@ def get_recommendation(df_index: str, lt_trend: str, df_stockmarket: str, df_inf
             df_inflation.iloc[0]['inflation'] == 'High':
         return "Wait! The market is uncertain!"
     
+def get_state_recommendation(classification: str, lt_trend: str, stockmarket: str, inflation: str) -> Union[str, None]:
+    """
+    Runs get_recommendation on one market state instead of the dashboard DataFrames.
+    Returns None when get_recommendation gives no recommendation or fails for that state.
+    """
+    df_index = pd.DataFrame({'value_classification': [classification]})
+    df_stockmarket = pd.DataFrame({'stockmarket': [stockmarket]})
+    df_inflation = pd.DataFrame({'inflation': [inflation]})
+    try:
+        return get_recommendation(df_index, lt_trend, df_stockmarket, df_inflation)
+    except Exception as e:
+        logger.info("Error generating recommendation: %s", e)
+        return None
+
 def get_index_trend(df: pd.DataFrame) -> str:
     """ Determine if Fear & Greed Index trend is stable or not """
     value = df.iloc[0]['value_classification']
@@ -12,6 +12,8 @@ import pandas as pd
 import logging
 from typing import Union
 
+from ratelimit import rate_limit
+
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,7 @@ def get_cpi(
 
     url = url.format(key = key, limit = limit, format = format)
     try:
+        rate_limit("cpi")
         response = requests.get(url, timeout=10).json()
         df = response['observations']
         data = pd.DataFrame(df)
@@ -0,0 +1,122 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import Union
+
+from fear_greed_index import get_index
+from stockmarket import get_raw_stockmarket_data
+from inflation import get_cpi
+from constants import FEAR_GREED_INDEX_URL
+URL = FEAR_GREED_INDEX_URL
+
+logging.basicConfig(level=logging.ERROR)
+logger = logging.getLogger(__name__)
+
+# CPI for a month is dated the 1st but published around the middle of the next month
+CPI_RELEASE_LAG_DAYS = 45
+
+
+def _daily(index: pd.Index) -> pd.DatetimeIndex:
+    """ Drops time of day and timezone, keeping the calendar date of each row. """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def build_panel(
+        df_index: pd.DataFrame,
+        stockmarket_data: pd.DataFrame,
+        cpi: pd.DataFrame,
+        release_lag_days: int = CPI_RELEASE_LAG_DAYS
+) -> pd.DataFrame:
+    """
+    Joins Fear & Greed, stock market and CPI data onto one sorted daily index.
+    Every row holds the last value of each source known on that day.
+    Parameters:
+    - df_index (pd.DataFrame): output of get_index.
+    - stockmarket_data (pd.DataFrame): output of get_raw_stockmarket_data.
+    - cpi (pd.DataFrame): output of get_cpi.
+    - release_lag_days (int): days after the CPI month start before the print is known.
+    Returns:
+    - pd.DataFrame indexed by date with columns fg_value, fg_classification,
+      stockmarket_value, stockmarket_date, cpi_value, cpi_month, annualized_inflation.
+    """
+    fg = pd.DataFrame({
+        'fg_value': df_index['value'].to_numpy(),
+        'fg_classification': df_index['value_classification'].to_numpy(),
+    }, index=_daily(df_index['date']))
+
+    stock = pd.DataFrame({
+        'stockmarket_value': stockmarket_data['Close'].to_numpy(),
+    }, index=_daily(stockmarket_data.index.date))
+    stock['stockmarket_date'] = stock.index
+
+    cpi = cpi.sort_values(by='date')
+    monthly_inflation_rate = (cpi['value'] / cpi['value'].shift(1) - 1) * 100
+    prints = pd.DataFrame({
+        'cpi_value': cpi['value'].to_numpy(),
+        'cpi_month': cpi['date'].to_numpy(),
+        'annualized_inflation': (((1 + monthly_inflation_rate / 100) ** 12 - 1) * 100).to_numpy(),
+    }, index=_daily(cpi['date']) + pd.Timedelta(days=release_lag_days))
+
+    sources = [fg, stock, prints]
+    for i, source in enumerate(sources):
+        source = source.sort_index()
+        sources[i] = source[~source.index.duplicated(keep='last')]
+
+    start = min(s.index[0] for s in sources if len(s))
+    #CPI rows are release dates, which may lie past the newest daily observation
+    end = max(s.index[-1] for s in sources[:2] if len(s))
+    dates = pd.date_range(start, end, freq='D', name='date')
+
+    #as-of join: each day takes the latest row of every source at or before it
+    return pd.concat([s.reindex(dates, method='ffill') for s in sources], axis=1)
+
+
+def get_panel(
+        fg_limit: int = 0,
+        ticker_name: str = "^GSPC",
+        period: str = "max",
+        cpi_limit: int = 240
+) -> Union[pd.DataFrame, None]:
+    """ Fetches the three sources and joins them with build_panel. """
+    df_index = get_index(URL, limit=fg_limit, format="json")
+    stockmarket_data = get_raw_stockmarket_data(ticker_name, period=period)
+    cpi = get_cpi(limit=cpi_limit)
+    if df_index is None or stockmarket_data is None or cpi is None:
+        logger.error("Missing source data, cannot build the panel")
+        return None
+    return build_panel(df_index, stockmarket_data, cpi)
+
+
+class AsOfPanel:
+    """
+    Fast last-known-value lookups into a panel built by build_panel.
+    The columns are kept as NumPy arrays, so a lookup is a binary search plus array indexing.
+    """
+
+    def __init__(self, panel: pd.DataFrame):
+        self.panel = panel
+        self.dates = panel.index.to_numpy(dtype='datetime64[ns]')
+        self.columns = {name: panel[name].to_numpy() for name in panel.columns}
+
+    def _positions(self, dates) -> np.ndarray:
+        dates = np.asarray(pd.DatetimeIndex(np.atleast_1d(dates)).tz_localize(None), dtype='datetime64[ns]')
+        return np.searchsorted(self.dates, dates, side='right') - 1
+
+    def as_of(self, date) -> Union[dict, None]:
+        """ Returns the values known on the given date, or None before the panel starts. """
+        i = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(date).tz_localize(None), 'ns'), side='right') - 1
+        if i < 0:
+            return None
+        return {name: values[i] for name, values in self.columns.items()}
+
+    def as_of_many(self, dates) -> pd.DataFrame:
+        """ Vectorized as_of for many dates; rows before the panel starts are NaN. """
+        positions = self._positions(dates)
+        valid = positions >= 0
+        df = self.panel.iloc[np.where(valid, positions, 0)].copy()
+        df.loc[~valid] = np.nan
+        df.index = pd.DatetimeIndex(np.atleast_1d(dates), name='date')
+        return df
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Union
+
+logging.basicConfig(level=logging.ERROR)
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = 'CRYPTO_PROFILE'
+PROFILE_DIR = os.getenv('CRYPTO_PROFILE_DIR', 'profiles')
+PROFILE_INTERVAL = 0.005
+
+
+def profiling_enabled(query_params: Union[dict, None] = None) -> bool:
+    """
+    Checks whether profiling was requested.
+    Parameters:
+    - query_params (dict): Streamlit query parameters; "?profile=1" turns profiling on.
+    Returns:
+    - bool: True if the environment variable or the query parameter is set.
+    """
+    values = [os.getenv(PROFILE_ENV, '')]
+    if query_params is not None:
+        values.append(query_params.get('profile', ''))
+    return any(str(v).lower() in ('1', 'true', 'yes', 'on') for v in values)
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Sampler:
+    """
+    Samples the call stack of one thread from a background thread.
+    Stacks are counted in the folded format read by flamegraph.pl, speedscope and inferno.
+    Parameters:
+    - thread_id (int): thread to sample; defaults to the calling thread.
+    - interval (float): seconds between samples.
+    """
+
+    def __init__(self, thread_id: int = None, interval: float = PROFILE_INTERVAL):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.started = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiling-sampler', daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str) -> None:
+        """ Writes the collected stacks as 'frame;frame;frame count' lines. """
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def write_profile(sampler: Sampler, name: str, directory: str = PROFILE_DIR) -> None:
+    """ Writes the stacks of a stopped sampler to '<directory>/<name>-<timestamp>.folded'. """
+    try:
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = os.path.join(directory, f"{name}-{timestamp}.folded")
+        sampler.write(path)
+        logger.info("Wrote profile of %s (%.2f s, %d samples) to %s",
+                    name, time.perf_counter() - sampler.started, sum(sampler.stacks.values()), path)
+    except OSError as e:
+        logger.error("Error writing profile: %s", e)
+
+
+@contextmanager
+def profile(name: str, enabled: bool = None, directory: str = PROFILE_DIR, interval: float = PROFILE_INTERVAL):
+    """
+    Samples the enclosed block and writes a flamegraph-compatible profile.
+    The file is named '<name>-<timestamp>.folded', so runs of different releases can be diffed.
+    Parameters:
+    - name (str): page or command being profiled.
+    - enabled (bool): overrides the CRYPTO_PROFILE environment variable.
+    - directory (str): where profiles are written.
+    - interval (float): seconds between samples.
+    """
+    if enabled is None:
+        enabled = profiling_enabled()
+    if not enabled:
+        yield
+        return
+
+    sampler = Sampler(interval=interval)
+    sampler.start()
+    try:
+        yield
+    finally:
+        #also runs when Streamlit interrupts the script with st.rerun()
+        sampler.stop()
+        write_profile(sampler, name, directory)
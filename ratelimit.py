@@ -0,0 +1,58 @@
+import os
+import time
+import sqlite3
+import logging
+import tempfile
+
+from constants import RATE_LIMITS
+
+logging.basicConfig(level=logging.ERROR)
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB', os.path.join(tempfile.gettempdir(), 'crypto_ratelimit.sqlite'))
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """ Opens the shared budget database, creating the table on first use. """
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tat REAL NOT NULL)")
+    return conn
+
+
+def reserve(name: str, path: str = RATE_LIMIT_DB, limits: dict = RATE_LIMITS) -> float:
+    """
+    Reserves the next request slot of an upstream in the shared token bucket.
+    Slots are handed out in the order processes ask for them, so callers queue instead of failing.
+    Parameters:
+    - name (str): upstream name, a key of RATE_LIMITS.
+    - path (str): SQLite file shared by every process on the host.
+    - limits (dict): upstream -> (requests, per seconds, burst).
+    Returns:
+    - float: seconds the caller has to wait before sending the request.
+    """
+    count, per, burst = limits[name]
+    interval = per / count
+    conn = _connect(path)
+    try:
+        #BEGIN IMMEDIATE takes the write lock, so only one process updates a bucket at a time
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT tat FROM buckets WHERE name = ?", (name,)).fetchone()
+        now = time.time()
+        tat = max(row[0] if row else now, now)
+        conn.execute("INSERT OR REPLACE INTO buckets (name, tat) VALUES (?, ?)", (name, tat + interval))
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return max(0.0, tat - (burst - 1) * interval - now)
+
+
+def rate_limit(name: str, path: str = RATE_LIMIT_DB, limits: dict = RATE_LIMITS) -> None:
+    """ Blocks until the upstream budget allows one more request. """
+    try:
+        wait = reserve(name, path, limits)
+    except sqlite3.Error as e:
+        logger.error("Rate limiter unavailable, sending request without it: %s", e)
+        return
+    if wait > 0:
+        logger.info("Waiting %.2f seconds for the %s budget", wait, name)
+        time.sleep(wait)
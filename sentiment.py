@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+import logging
+import warnings
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Union
+
+from stockmarket import get_raw_multi_stockmarket_data
+from constants import SENTIMENT_BANDS, SENTIMENT_LABELS
+
+logging.basicConfig(level=logging.ERROR)
+logger = logging.getLogger(__name__)
+
+VOLATILITY_WINDOW = 20
+MOMENTUM_WINDOW = 125
+DRAWDOWN_WINDOW = 252
+VOLUME_WINDOW = 20
+RANK_WINDOW = 90
+
+
+def get_multi_asset_data(tickers: list, period: str = "2y") -> Union[dict, None]:
+    """
+    Fetches OHLCV data for several tickers in one batched download as wide frames.
+    Parameters:
+    - tickers (list): symbols as specified by the yfinance library.
+    - period (str): period for which to fetch data. Default is 2 years.
+    Returns:
+    - dict with 'Close' and 'Volume' pd.DataFrames (dates x tickers) | None
+    """
+    data = get_raw_multi_stockmarket_data(tickers, period=period)
+    if data is None:
+        return None
+
+    #days an asset did not trade (e.g. stocks on weekends) stay NaN
+    close = data['Close'].copy()
+    volume = data['Volume'].reindex_like(close)
+    close.index = volume.index = pd.to_datetime(close.index).normalize()
+    close = close.sort_index()
+    volume = volume.sort_index()
+
+    missing = close.columns[close.isna().all()]
+    if len(missing):
+        logger.info("No stock market data found for the tickers: %s", list(missing))
+        close = close.drop(columns=missing)
+        volume = volume.drop(columns=missing)
+    if close.empty:
+        return None
+    return {'Close': close, 'Volume': volume}
+
+
+def _rolling(values: np.ndarray, window: int, func) -> np.ndarray:
+    """ Applies func over trailing windows of every column; NaN until the window is full. """
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        out[window - 1:] = func(sliding_window_view(values, window, axis=0), axis=-1)
+    return out
+
+
+def _percentile_rank(values: np.ndarray, window: int = RANK_WINDOW) -> np.ndarray:
+    """ Ranks each value against its own trailing window, scaled to 0-100. """
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window, axis=0)
+        ranked = (windows <= windows[..., -1:]).mean(axis=-1) * 100
+        ranked[np.isnan(windows).any(axis=-1)] = np.nan
+        out[window - 1:] = ranked
+    return out
+
+
+def _components(prices: np.ndarray, volumes: np.ndarray) -> dict:
+    """ Calculates the sentiment components for columns that share the same trading rows. """
+    returns = np.full(prices.shape, np.nan)
+    returns[1:] = np.log(prices[1:] / prices[:-1])
+
+    #high volatility is fear, so the rank is inverted
+    volatility = _rolling(returns, VOLATILITY_WINDOW, np.std)
+    volatility_score = 100 - _percentile_rank(volatility)
+
+    #distance of the price from its moving average
+    momentum = prices / _rolling(prices, MOMENTUM_WINDOW, np.mean) - 1
+    momentum_score = _percentile_rank(momentum)
+
+    #distance of the price from its trailing peak
+    drawdown = prices / _rolling(prices, DRAWDOWN_WINDOW, np.max) - 1
+    drawdown_score = _percentile_rank(drawdown)
+
+    #unusual volume counts as greed on up days and as fear on down days
+    with np.errstate(divide='ignore', invalid='ignore'):
+        surge = np.log(volumes / _rolling(volumes, VOLUME_WINDOW, np.mean))
+    surge[~np.isfinite(surge)] = np.nan
+    surge_score = _percentile_rank(surge * np.sign(returns))
+
+    return {
+        'volatility': volatility_score,
+        'momentum': momentum_score,
+        'drawdown': drawdown_score,
+        'volume_surge': surge_score,
+    }
+
+
+def get_sentiment_components(close: pd.DataFrame, volume: pd.DataFrame) -> dict:
+    """
+    Calculates the sentiment components for every asset and date at once.
+    Each component is ranked against its own history, so 0 means fear and 100 means greed.
+    Windows count each asset's own trading rows: assets are grouped by trading calendar
+    and every group is computed in one pass, so weekends never enter a stock's windows.
+    Parameters:
+    - close (pd.DataFrame): closing prices, dates x tickers, NaN on days without trading.
+    - volume (pd.DataFrame): traded volume, dates x tickers.
+    Returns:
+    - dict of pd.DataFrames: 'volatility', 'momentum', 'drawdown', 'volume_surge'.
+    """
+    prices = close.to_numpy(dtype=float)
+    volumes = volume.reindex_like(close).to_numpy(dtype=float)
+    traded = ~np.isnan(prices)
+
+    groups = {}
+    for col in range(prices.shape[1]):
+        groups.setdefault(traded[:, col].tobytes(), []).append(col)
+
+    results = {}
+    for cols in groups.values():
+        rows = np.flatnonzero(traded[:, cols[0]])
+        if len(rows) == 0:
+            continue
+        grid = np.ix_(rows, cols)
+        for name, values in _components(prices[grid], volumes[grid]).items():
+            out = results.setdefault(name, np.full(prices.shape, np.nan))
+            out[grid] = values
+
+    return {name: pd.DataFrame(results.get(name, np.full(prices.shape, np.nan)),
+                               index=close.index, columns=close.columns)
+            for name in ('volatility', 'momentum', 'drawdown', 'volume_surge')}
+
+
+def get_sentiment_scores(components: dict) -> pd.DataFrame:
+    """
+    Averages the sentiment components into a single 0-100 score per asset and date.
+    Components still warming up are skipped, so short histories are scored from the ones available.
+    """
+    stacked = np.stack([c.to_numpy() for c in components.values()])
+    first = next(iter(components.values()))
+    with warnings.catch_warnings():
+        #dates where no component is ready yet stay NaN
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        scores = np.nanmean(stacked, axis=0)
+    return pd.DataFrame(scores, index=first.index, columns=first.columns)
+
+
+def classify_sentiment(scores: Union[pd.Series, pd.DataFrame]) -> Union[pd.Series, pd.DataFrame]:
+    """ Labels 0-100 scores with the Fear & Greed bands drawn on the dashboard; 25 is Fear, 100 Extreme Greed. """
+    if isinstance(scores, pd.DataFrame):
+        return scores.apply(classify_sentiment)
+    #bands include their lower line; the last one is left open so 100 stays Extreme Greed
+    bins = SENTIMENT_BANDS[:-1] + [np.inf]
+    return pd.cut(scores, bins=bins, labels=SENTIMENT_LABELS, right=False)
+
+
+def get_sentiment_index(tickers: list, period: str = "2y") -> Union[pd.DataFrame, None]:
+    """
+    Computes the current Fear & Greed style score for many assets from their price data.
+    Parameters:
+    - tickers (list): symbols as specified by the yfinance library.
+    - period (str): period of price history used to rank the components.
+    Returns:
+    - pd.DataFrame with one row per ticker: value, value_classification and the components | None
+    """
+    data = get_multi_asset_data(tickers, period=period)
+    if data is None:
+        return None
+    try:
+        components = get_sentiment_components(data['Close'], data['Volume'])
+        scores = get_sentiment_scores(components)
+
+        #latest row each asset traded on
+        df = pd.DataFrame({name: c.ffill().iloc[-1] for name, c in components.items()})
+        df.insert(0, 'value', scores.ffill().iloc[-1].round())
+        df.insert(1, 'value_classification', classify_sentiment(df['value']).astype('object'))
+        df.index.name = 'ticker'
+        return df.reset_index()
+    except Exception as e:
+        logger.info("Error computing sentiment index: %s", e)
+        return None
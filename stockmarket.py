@@ -4,7 +4,7 @@ import logging
 from datetime import datetime
 from typing import Union
 
-from typing import Union
+from ratelimit import rate_limit
 
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
@@ -19,6 +19,7 @@ def get_raw_stockmarket_data(ticker_name: str="^GSPC", period: str="1y") -> Unio
     - pd.DataFrame | None
     """
     try:
+        rate_limit("yahoo")
         data = yf.Ticker(ticker_name).history(period = period)
         if data.empty:
             logger.info("No stock market data found for the ticker: %s", ticker_name)
@@ -28,6 +29,28 @@ def get_raw_stockmarket_data(ticker_name: str="^GSPC", period: str="1y") -> Unio
         logger.error(f"Error getting stock market data: %s", e)
         return None
 
+def get_raw_multi_stockmarket_data(tickers: list, period: str="1y") -> Union[pd.DataFrame, None]:
+    """
+    Fetches stock market values for several tickers in one batched download.
+    The whole batch spends a single token of the "yahoo" rate limit budget.
+    Parameters:
+    - tickers (list): symbols as specified by the yfinance library.
+    - period (str): period for which to fetch data. Default is 1 year.
+    Returns:
+    - pd.DataFrame with (price, ticker) columns and one row per calendar date | None
+    """
+    try:
+        rate_limit("yahoo")
+        data = yf.download(list(tickers), period=period, group_by='column', ignore_tz=True,
+                           progress=False, multi_level_index=True)
+        if data is None or data.empty:
+            logger.info("No stock market data found for the tickers: %s", tickers)
+            return None
+        return data
+    except Exception as e:
+        logger.error("Error getting stock market data: %s", e)
+        return None
+
 def get_yearly_stockmarket_trend(stockmarket_data: pd.DataFrame) -> Union[pd.DataFrame, None]:
     """
     Converts the raw stockmarket pd.DataFrame into a pd.DataFrame that contains:
@@ -0,0 +1,178 @@
+from typing import Union
+
+from functions import get_state_recommendation
+
+
+class RingBuffer:
+    """ Fixed-size buffer that overwrites its oldest value once it is full. """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = [None] * size
+        self.start = 0
+        self.count = 0
+
+    def append(self, value) -> Union[float, None]:
+        """ Adds a value and returns the one it pushed out, if any. """
+        if self.count < self.size:
+            self.values[(self.start + self.count) % self.size] = value
+            self.count += 1
+            return None
+        evicted = self.values[self.start]
+        self.values[self.start] = value
+        self.start = (self.start + 1) % self.size
+        return evicted
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int):
+        """ Item i counted from the oldest value; negative i counts from the newest. """
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("ring buffer index out of range")
+        return self.values[(self.start + i) % self.size]
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.size
+
+
+class IndicatorEngine:
+    """
+    Keeps the dashboard indicators up to date one data point at a time.
+    Every update costs the same regardless of history length, and the recommendation
+    is only recomputed when the F&G, stock market or inflation state changes.
+    Parameters:
+    - trend_window (int): number of F&G readings checked by get_index_trend.
+    - stable_days (int): readings inside the band needed for a stable trend.
+    - fear_upper (int): upper bound of the fear band.
+    - greed_lower (int): lower bound of the greed band.
+    - stock_lookback (int): rows compared by get_montly_stockmarket_trend.
+    - cpi_window (int): number of CPI prints used by get_inflation.
+    """
+
+    def __init__(
+            self,
+            trend_window: int = 21,
+            stable_days: int = 18,
+            fear_upper: int = 47,
+            greed_lower: int = 55,
+            stock_lookback: int = 25,
+            cpi_window: int = 13
+    ):
+        self.stable_days = stable_days
+        self.fear_upper = fear_upper
+        self.greed_lower = greed_lower
+
+        self.index_values = RingBuffer(trend_window)
+        self.index_classification = None
+        self.fear_count = 0
+        self.greed_count = 0
+
+        self.closes = RingBuffer(stock_lookback)
+        self.cpi = RingBuffer(cpi_window)
+
+        self.state = None
+        self.recommendation = None
+
+    def _in_fear(self, value: float) -> bool:
+        return 0 <= value <= self.fear_upper
+
+    def _in_greed(self, value: float) -> bool:
+        return self.greed_lower <= value <= 100
+
+    def update_index(self, value: float, classification: str) -> Union[str, None]:
+        """ Adds the newest Fear & Greed reading; returns a new recommendation if it changed. """
+        evicted = self.index_values.append(value)
+        if evicted is not None:
+            self.fear_count -= self._in_fear(evicted)
+            self.greed_count -= self._in_greed(evicted)
+        self.fear_count += self._in_fear(value)
+        self.greed_count += self._in_greed(value)
+        self.index_classification = classification
+        return self._emit()
+
+    def update_stockmarket(self, close: float) -> Union[str, None]:
+        """ Adds the newest stock market close; returns a new recommendation if it changed. """
+        self.closes.append(close)
+        return self._emit()
+
+    def update_cpi(self, value: float) -> Union[str, None]:
+        """ Adds the newest monthly CPI index; returns a new recommendation if it changed. """
+        self.cpi.append(value)
+        return self._emit()
+
+    @property
+    def lt_trend(self) -> Union[str, None]:
+        """ Same result as get_index_trend on the readings in the window. """
+        if not self.index_values.full:
+            return None
+        if self.index_classification in ("Fear", "Extreme Fear"):
+            return "Stable" if self.fear_count >= self.stable_days else "Unstable"
+        if self.index_classification in ("Greed", "Extreme Greed"):
+            if self.greed_count >= self.stable_days:
+                return "Long-term trend is stable"
+            return "Long-term trend is unstable"
+        return None
+
+    @property
+    def stockmarket_trend(self) -> Union[str, None]:
+        """ Same result as get_montly_stockmarket_trend on the closes in the window. """
+        if not self.closes.full:
+            return None
+        start_month = self.closes[0]
+        end_month = self.closes[-1]
+        if start_month < end_month:
+            return "Rising"
+        elif start_month == end_month:
+            return "Stable"
+        return "Falling"
+
+    @property
+    def monthly_change(self) -> Union[float, None]:
+        """ Stock market change over the lookback in percent, as shown on the dashboard. """
+        if not self.closes.full:
+            return None
+        return (self.closes[-1] - self.closes[0]) / self.closes[0] * 100
+
+    @property
+    def inflation(self) -> Union[dict, None]:
+        """ Same values as get_inflation on the CPI prints in the window. """
+        if len(self.cpi) < 2:
+            return None
+        first_value = float(round(self.cpi[-1], 2))
+        last_value = float(round(self.cpi[-2], 2))
+        monthly_inflation_rate = ((first_value / last_value) - 1) * 100
+        annualized_inflation = ((1 + monthly_inflation_rate / 100) ** 12 - 1) * 100
+        if annualized_inflation <= 2:
+            estimate = "Low"
+        elif annualized_inflation <= 5:
+            estimate = "Moderate"
+        else:
+            estimate = "High"
+        back_end = self.cpi[0]
+        front_end = self.cpi[-1]
+        return {
+            'current_inflation': round((monthly_inflation_rate * 10), 1),
+            'inflation_estimate': estimate,
+            'inflation_growth': round((((front_end - back_end) / back_end) * 100), 1),
+        }
+
+    def _emit(self) -> Union[str, None]:
+        """ Recomputes the recommendation when the state changed and returns it if it is new. """
+        inflation = self.inflation
+        if not (self.index_values.full and self.closes.full and inflation):
+            return None
+        estimate = inflation['inflation_estimate']
+        state = (self.index_classification, self.lt_trend, self.stockmarket_trend, estimate)
+        if state == self.state:
+            return None
+        self.state = state
+
+        recommendation = get_state_recommendation(*state)
+        if recommendation is None or recommendation == self.recommendation:
+            return None
+        self.recommendation = recommendation
+        return recommendation
@@ -0,0 +1,310 @@
+import os
+import sys
+import math
+import pickle
+import itertools
+import logging
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.util import Finalize
+from functools import lru_cache
+from typing import Union
+
+from fear_greed_index import get_index
+from stockmarket import get_raw_stockmarket_data
+from inflation import get_cpi
+from panel import build_panel
+from functions import get_state_recommendation
+from profiling import profile, profiling_enabled, Sampler, write_profile
+from constants import FEAR_GREED_INDEX_URL
+URL = FEAR_GREED_INDEX_URL
+
+logging.basicConfig(level=logging.ERROR)
+logger = logging.getLogger(__name__)
+
+# Grid of the thresholds used by get_index_trend, get_montly_stockmarket_trend and get_inflation.
+# Parameters with expensive indicators come first so neighbouring grid points share cached arrays.
+DEFAULT_SWEEP_GRID = {
+    'trend_window': [14, 21, 28],
+    'fear_upper': [40, 45, 47, 50],
+    'greed_lower': [50, 55, 60],
+    'stock_lookback': [10, 25, 50],
+    'stable_days': [12, 15, 18],
+    'inflation_low': [2.0, 3.0],
+    'inflation_high': [4.0, 5.0, 6.0],
+}
+
+# Fetched history is stored here so repeated sweeps do not download it again
+SWEEP_HISTORY_PATH = os.getenv('SWEEP_HISTORY_PATH', os.path.join('data', 'sweep_history.pkl'))
+
+FEAR_CLASSES = ["Fear", "Extreme Fear"]
+GREED_CLASSES = ["Greed", "Extreme Greed"]
+
+# Position taken on each dashboard recommendation; any other answer keeps the current position
+POSITIONS = {
+    "It's safe to buy!": 1,
+    "Don't sell! Crypto will rise further!": 1,
+    "Stop! Don't buy!": 0,
+    "Sell now! The Crypto market is a bubble!": 0,
+}
+
+# Values get_index_trend, get_montly_stockmarket_trend and get_inflation produce, in code order
+LT_TRENDS = [None, "Stable", "Unstable", "Long-term trend is stable", "Long-term trend is unstable"]
+STOCK_TRENDS = ["Falling", "Stable", "Rising"]
+INFLATION_ESTIMATES = ["Low", "Moderate", "High"]
+
+_history = None
+
+
+def get_sweep_history(
+        crypto_ticker: str = "BTC-USD",
+        stock_ticker: str = "^GSPC",
+        period: str = "max",
+        cpi_limit: int = 240
+) -> Union[dict, None]:
+    """
+    Fetches the full history needed to backtest the recommendation thresholds.
+    Parameters:
+    - crypto_ticker (str): asset the recommendation is traded on, as specified by yfinance.
+    - stock_ticker (str): stock market index used for the trend.
+    - period (str): period of price history to fetch.
+    - cpi_limit (int): number of months of CPI indexes to fetch.
+    Returns:
+    - dict of numpy arrays aligned on one daily index | None
+    """
+    df_index = get_index(URL, limit=0, format="json")
+    crypto = get_raw_stockmarket_data(crypto_ticker, period=period)
+    stock = get_raw_stockmarket_data(stock_ticker, period=period)
+    cpi = get_cpi(limit=cpi_limit)
+    if df_index is None or crypto is None or stock is None or cpi is None:
+        logger.error("Missing history, cannot run the parameter sweep")
+        return None
+
+    #the panel carries each CPI print from its release date, so the backtest cannot peek ahead
+    panel = build_panel(df_index, stock, cpi)
+    panel = panel[panel['fg_value'].notna()]
+    dates = panel.index
+
+    crypto_close = pd.Series(crypto['Close'].to_numpy(), index=pd.to_datetime(crypto.index.date))
+    stock_close = pd.Series(stock['Close'].to_numpy(), index=pd.to_datetime(stock.index.date))
+
+    return {
+        'dates': dates.to_numpy(),
+        'fg_value': panel['fg_value'].to_numpy(dtype=float),
+        'fg_fear': panel['fg_classification'].isin(FEAR_CLASSES).to_numpy(),
+        'fg_greed': panel['fg_classification'].isin(GREED_CLASSES).to_numpy(),
+        'fg_classification': panel['fg_classification'].astype(str).to_numpy(),
+        'crypto_close': crypto_close.reindex(dates).ffill().to_numpy(dtype=float),
+        'stock_close': stock_close.to_numpy(dtype=float),
+        'stock_dates': stock_close.index.to_numpy(),
+        'inflation': panel['annualized_inflation'].to_numpy(dtype=float),
+    }
+
+
+def load_sweep_history(path: str = SWEEP_HISTORY_PATH, refresh: bool = False) -> Union[dict, None]:
+    """
+    Reads the stored sweep history, fetching and storing it first if it is missing.
+    Parameters:
+    - path (str): pickle file holding the output of get_sweep_history.
+    - refresh (bool): fetch the history again even if it is already stored.
+    Returns:
+    - dict of numpy arrays aligned on one daily index | None
+    """
+    if not refresh and os.path.exists(path):
+        with open(path, 'rb') as f:
+            history = pickle.load(f)
+        #histories stored before the classification was kept are fetched again
+        if 'fg_classification' in history:
+            return history
+
+    history = get_sweep_history()
+    if history is None:
+        return None
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(history, f)
+    except OSError as e:
+        logger.error("Error storing sweep history: %s", e)
+    return history
+
+
+def _stop_worker_profile(sampler: Sampler) -> None:
+    sampler.stop()
+    write_profile(sampler, f"sweep-worker{os.getpid()}")
+
+
+def _init_worker(history: dict, profiling: bool = False) -> None:
+    """
+    Stores the history in the worker process so it is sent only once per process.
+    With profiling on, the worker samples itself and writes its own profile when it exits.
+    """
+    global _history
+    _history = history
+    _band_count.cache_clear()
+    _stock_rising.cache_clear()
+    _classification_codes.cache_clear()
+    if profiling:
+        sampler = Sampler()
+        sampler.start()
+        #multiprocessing runs finalizers with an exit priority when the worker shuts down
+        Finalize(sampler, _stop_worker_profile, args=(sampler,), exitpriority=10)
+
+
+@lru_cache(maxsize=None)
+def _band_count(lower: float, upper: float, window: int) -> np.ndarray:
+    """ Number of F&G readings inside [lower, upper] over the trailing window of days. """
+    values = _history['fg_value']
+    inside = ((values >= lower) & (values <= upper)).astype(int)
+    counts = np.cumsum(inside)
+    counts[window:] = counts[window:] - counts[:-window]
+    counts[:window - 1] = -1
+    return counts
+
+
+@lru_cache(maxsize=None)
+def _stock_rising(lookback: int) -> np.ndarray:
+    """
+    Stock market trend per day: 1 rising, -1 falling, 0 stable or unknown.
+    Like get_montly_stockmarket_trend, a lookback of 25 compares the last of 25 rows with the first.
+    """
+    if lookback < 2:
+        raise ValueError("stock_lookback must be at least 2 rows")
+    close = _history['stock_close']
+    gap = lookback - 1
+    trend = np.zeros(close.shape)
+    trend[gap:] = np.sign(close[gap:] - close[:-gap])
+    daily = pd.Series(trend, index=_history['stock_dates'])
+    daily = daily.reindex(_history['dates'], method='ffill').fillna(0)
+    return daily.to_numpy()
+
+
+@lru_cache(maxsize=None)
+def _classification_codes() -> tuple:
+    """ F&G classification of each day as integer codes, plus the names the codes stand for. """
+    names, codes = np.unique(_history['fg_classification'], return_inverse=True)
+    return codes, names
+
+
+@lru_cache(maxsize=None)
+def _state_position(classification: str, lt_trend: str, stockmarket: str, inflation: str) -> float:
+    """ Position the dashboard recommendation for one state asks for; NaN keeps the current one. """
+    recommendation = get_state_recommendation(classification, lt_trend, stockmarket, inflation)
+    return POSITIONS.get(recommendation, np.nan)
+
+
+def backtest(params: dict, history: dict = None) -> dict:
+    """
+    Backtests one set of recommendation thresholds.
+    Every day's state goes through the dashboard's own get_recommendation, so Neutral days and
+    its quirks (e.g. every Fear day being a buy) are backtested exactly as the app shows them.
+    "It's safe to buy!" and "Don't sell!" hold crypto, "Stop! Don't buy!" and "Sell now!" hold
+    cash, and any other answer keeps the current position.
+    Parameters:
+    - params (dict): one grid point, see DEFAULT_SWEEP_GRID.
+    - history (dict): output of get_sweep_history; defaults to the worker's history.
+    Returns:
+    - dict with the parameters and the backtest metrics.
+    """
+    if history is not None and history is not _history:
+        _init_worker(history)
+
+    #lt_trend as get_index_trend reports it: Fear and Greed days only, once the window is full
+    window = int(params['trend_window'])
+    fear_count = _band_count(0, params['fear_upper'], window)
+    greed_count = _band_count(params['greed_lower'], 100, window)
+    fear = _history['fg_fear']
+    greed = _history['fg_greed']
+    lt_trend = np.zeros(fear.shape, dtype=int)
+    lt_trend[fear] = np.where(fear_count[fear] >= params['stable_days'], 1, 2)
+    lt_trend[greed] = np.where(greed_count[greed] >= params['stable_days'], 3, 4)
+
+    stock = _stock_rising(int(params['stock_lookback'])).astype(int) + 1
+
+    inflation = _history['inflation']
+    estimate = np.where(inflation <= params['inflation_low'], 0,
+                        np.where(inflation <= params['inflation_high'], 1, 2))
+    ready = (fear_count >= 0) & ~np.isnan(inflation)
+
+    #there are only a few hundred distinct states, so each one is decided once
+    classification, names = _classification_codes()
+    state = ((classification * 5 + lt_trend) * 3 + stock) * 3 + estimate
+    states, inverse = np.unique(state[ready], return_inverse=True)
+    positions = np.array([_state_position(names[s // 45], LT_TRENDS[s // 9 % 5],
+                                          STOCK_TRENDS[s // 3 % 3], INFLATION_ESTIMATES[s % 3])
+                          for s in states], dtype=float)
+
+    signal = np.full(state.shape, np.nan)
+    signal[ready] = positions[inverse]
+    position = pd.Series(signal).ffill().fillna(0).to_numpy()
+
+    close = _history['crypto_close']
+    returns = np.zeros(close.shape)
+    returns[1:] = np.nan_to_num(close[1:] / close[:-1] - 1)
+    strategy = np.zeros(close.shape)
+    strategy[1:] = position[:-1] * returns[1:]
+
+    equity = np.cumprod(1 + strategy)
+    peak = np.maximum.accumulate(equity)
+    std = strategy.std()
+
+    return {
+        **params,
+        'total_return': round((equity[-1] - 1) * 100, 2),
+        'sharpe': round(strategy.mean() / std * math.sqrt(365), 2) if std > 0 else 0.0,
+        'max_drawdown': round((equity / peak - 1).min() * 100, 2),
+        'exposure': round(position.mean() * 100, 1),
+        'trades': int(np.count_nonzero(np.diff(position))),
+    }
+
+
+def get_grid(grid: dict = DEFAULT_SWEEP_GRID) -> list:
+    """ Expands a parameter grid into a list of parameter dicts, skipping overlapping bands and lookbacks under 2 rows. """
+    names = list(grid)
+    points = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    return [p for p in points
+            if p.get('stable_days', 0) <= p.get('trend_window', math.inf)
+            and p.get('stock_lookback', 2) >= 2
+            and p.get('fear_upper', 0) < p.get('greed_lower', math.inf)
+            and p.get('inflation_low', 0) < p.get('inflation_high', math.inf)]
+
+
+def run_sweep(
+        history: dict,
+        grid: dict = DEFAULT_SWEEP_GRID,
+        sort_by: str = 'sharpe',
+        workers: int = None
+) -> pd.DataFrame:
+    """
+    Evaluates every grid point over the history on a process pool.
+    Parameters:
+    - history (dict): output of get_sweep_history.
+    - grid (dict): parameter name -> list of values to try.
+    - sort_by (str): backtest metric used to rank the configurations.
+    - workers (int): number of processes. Default is one per core.
+    With profiling enabled (see profiling.py) every worker writes its own sweep-worker<pid> profile.
+    Returns:
+    - pd.DataFrame with one row per configuration, best first.
+    """
+    points = get_grid(grid)
+    workers = workers or os.cpu_count() or 1
+    #contiguous chunks keep grid points that share indicators on the same worker cache
+    chunksize = max(1, math.ceil(len(points) / (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(history, profiling_enabled())) as pool:
+        results = list(pool.map(backtest, points, chunksize=chunksize))
+    df = pd.DataFrame(results)
+    df.sort_values(by=[sort_by, 'total_return'], ascending=False, inplace=True)
+    df.reset_index(drop=True, inplace=True)
+    return df
+
+
+if __name__ == "__main__":
+    #the "sweep" profile covers loading and waiting on the pool; the backtests
+    #themselves show up in the per-worker profiles written by _init_worker
+    with profile("sweep"):
+        #pass --refresh to download the history again
+        history = load_sweep_history(refresh="--refresh" in sys.argv)
+        if history is not None:
+            print(run_sweep(history).head(20).to_string())
@@ -0,0 +1,79 @@
+import time
+import numpy as np
+import pandas as pd
+
+from panel import build_panel, AsOfPanel, CPI_RELEASE_LAG_DAYS
+
+
+def _sources() -> tuple:
+    #F&G as get_index returns it: newest first, dates from unix timestamps
+    timestamps = pd.date_range('2022-01-01', periods=400).astype('datetime64[s]').astype('int64')
+    df_index = pd.DataFrame({
+        'value': np.arange(400) % 100,
+        'value_classification': 'Fear',
+        'date': pd.to_datetime(timestamps, unit='s'),
+    }).iloc[::-1].reset_index(drop=True)
+
+    #S&P as yfinance returns it: trading days on a tz-aware index
+    trading = pd.bdate_range('2022-01-03', periods=280, tz='America/New_York', name='Date')
+    stockmarket_data = pd.DataFrame({'Close': np.arange(280, dtype=float) + 1000}, index=trading)
+
+    #CPI as get_cpi returns it: monthly, newest first
+    months = pd.date_range('2021-06-01', periods=20, freq='MS')
+    cpi = pd.DataFrame({'date': months, 'value': np.linspace(300, 320, 20)}).iloc[::-1].reset_index(drop=True)
+    return df_index, stockmarket_data, cpi
+
+
+def test_cpi_print_hidden_until_release():
+    panel = build_panel(*_sources())
+    month = pd.Timestamp('2022-03-01')
+    release = month + pd.Timedelta(days=CPI_RELEASE_LAG_DAYS)
+
+    assert panel.loc[release - pd.Timedelta(days=1), 'cpi_month'] == pd.Timestamp('2022-02-01')
+    assert panel.loc[release, 'cpi_month'] == month
+
+
+def test_weekend_row_carries_friday_close():
+    df_index, stockmarket_data, cpi = _sources()
+    panel = build_panel(df_index, stockmarket_data, cpi)
+
+    friday = pd.Timestamp('2022-03-11')
+    friday_close = stockmarket_data.loc[stockmarket_data.index.date == friday.date(), 'Close'].iloc[0]
+    for day in ['2022-03-12', '2022-03-13']:
+        row = panel.loc[day]
+        assert not np.isnan(row['fg_value'])
+        assert row['stockmarket_value'] == friday_close
+        assert row['stockmarket_date'] == friday
+
+
+def test_as_of_before_start_is_none():
+    lookup = AsOfPanel(build_panel(*_sources()))
+    assert lookup.as_of(lookup.panel.index[0] - pd.Timedelta(days=1)) is None
+    assert lookup.as_of(lookup.panel.index[0]) is not None
+
+
+def test_as_of_many_matches_as_of():
+    lookup = AsOfPanel(build_panel(*_sources()))
+    rng = np.random.default_rng(0)
+    start = lookup.panel.index[0] - pd.Timedelta(days=10)
+    naive = start + pd.to_timedelta(rng.integers(0, 500 * 24, 300), unit='h')
+    aware = naive.tz_localize('America/New_York')
+
+    for dates in (naive, aware):
+        many = lookup.as_of_many(dates)
+        for date, (_, row) in zip(dates, many.iterrows()):
+            single = lookup.as_of(date)
+            if single is None:
+                assert row.isna().all()
+                continue
+            for name, value in single.items():
+                assert (pd.isna(value) and pd.isna(row[name])) or value == row[name]
+
+
+def test_as_of_handles_thousands_of_lookups_per_second():
+    lookup = AsOfPanel(build_panel(*_sources()))
+    dates = pd.date_range('2022-01-01', periods=5000, freq='2h')
+    start = time.perf_counter()
+    for date in dates:
+        lookup.as_of(date)
+    assert len(dates) / (time.perf_counter() - start) > 2000
@@ -0,0 +1,36 @@
+import time
+import multiprocessing
+
+from ratelimit import rate_limit
+
+LIMITS = {"api": (10, 1, 3)}
+PROCESSES = 8
+CALLS = 5
+
+
+def _worker(path: str, queue) -> None:
+    for _ in range(CALLS):
+        rate_limit("api", path, LIMITS)
+        queue.put(time.time())
+
+
+def test_budget_holds_across_processes(tmp_path):
+    path = str(tmp_path / "ratelimit.sqlite")
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_worker, args=(path, queue)) for _ in range(PROCESSES)]
+
+    start = time.time()
+    for p in processes:
+        p.start()
+    stamps = sorted(queue.get(timeout=30) for _ in range(PROCESSES * CALLS))
+    for p in processes:
+        p.join()
+
+    count, per, burst = LIMITS["api"]
+    # no window of `per` seconds holds more than the rate plus the burst
+    busiest = max(sum(1 for t in stamps if s <= t < s + per) for s in stamps)
+    assert busiest <= count + burst
+
+    # after the burst, every call waits for its own slot
+    total = PROCESSES * CALLS
+    assert stamps[-1] - start >= (total - burst) * per / count
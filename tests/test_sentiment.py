@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from sentiment import (get_sentiment_components, get_sentiment_scores, classify_sentiment,
+                       DRAWDOWN_WINDOW, RANK_WINDOW)
+
+
+def _prices(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+
+
+def _volumes(n: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).integers(1_000_000, 2_000_000, n).astype(float)
+
+
+def test_stock_windows_skip_weekends_next_to_crypto():
+    days = pd.date_range('2022-01-03', periods=600, name='Date')
+    trading = days[days.dayofweek < 5]
+
+    close = pd.DataFrame({'BTC-USD': _prices(len(days), 1)}, index=days)
+    close['SPY'] = pd.Series(_prices(len(trading), 2), index=trading)
+    volume = pd.DataFrame({'BTC-USD': _volumes(len(days), 3)}, index=days)
+    volume['SPY'] = pd.Series(_volumes(len(trading), 4), index=trading)
+
+    mixed = get_sentiment_components(close, volume)
+    alone = get_sentiment_components(close[['SPY']].loc[trading], volume[['SPY']].loc[trading])
+
+    for name, values in mixed.items():
+        #nothing is scored on days the stock did not trade
+        assert values['SPY'].loc[days.difference(trading)].isna().all()
+        pd.testing.assert_series_equal(values['SPY'].loc[trading], alone[name]['SPY'])
+
+
+def test_short_history_scored_from_available_components():
+    n = 252
+    assert n < DRAWDOWN_WINDOW + RANK_WINDOW
+    days = pd.bdate_range('2023-01-02', periods=n)
+    close = pd.DataFrame({'NEW': _prices(n, 5)}, index=days)
+    volume = pd.DataFrame({'NEW': _volumes(n, 6)}, index=days)
+
+    components = get_sentiment_components(close, volume)
+    scores = get_sentiment_scores(components)
+
+    assert components['drawdown']['NEW'].isna().all()
+    last = [c['NEW'].iloc[-1] for name, c in components.items() if name != 'drawdown']
+    assert scores['NEW'].iloc[-1] == np.mean(last)
+    #no component is ready on the first day
+    assert np.isnan(scores['NEW'].iloc[0])
+
+
+def test_zero_volume_ticker_scored_without_volume_surge():
+    n = 400
+    days = pd.bdate_range('2022-01-03', periods=n)
+    close = pd.DataFrame({'IDX': _prices(n, 7)}, index=days)
+    volume = pd.DataFrame({'IDX': np.zeros(n)}, index=days)
+
+    components = get_sentiment_components(close, volume)
+    scores = get_sentiment_scores(components)
+
+    assert components['volume_surge']['IDX'].isna().all()
+    assert 0 <= scores['IDX'].iloc[-1] <= 100
+
+
+def test_band_edges_belong_to_the_band_above():
+    scores = pd.Series([0, 24.9, 25, 44.9, 45, 54.9, 55, 74.9, 75, 100, np.nan])
+    labels = classify_sentiment(scores)
+    assert list(labels[:-1]) == [
+        "Extreme Fear", "Extreme Fear", "Fear", "Fear", "Neutral",
+        "Neutral", "Greed", "Greed", "Extreme Greed", "Extreme Greed",
+    ]
+    assert pd.isna(labels.iloc[-1])
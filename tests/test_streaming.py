@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from functions import get_index_trend
+from stockmarket import get_montly_stockmarket_trend
+from inflation import get_inflation
+from streaming import IndicatorEngine, RingBuffer
+
+
+def _classification(value: float) -> str:
+    """ Same bands as constants.SENTIMENT_BANDS: a value on a line belongs to the band above. """
+    if value < 25:
+        return "Extreme Fear"
+    elif value < 45:
+        return "Fear"
+    elif value < 55:
+        return "Neutral"
+    elif value < 75:
+        return "Greed"
+    return "Extreme Greed"
+
+
+def test_ring_buffer_overwrites_oldest():
+    buffer = RingBuffer(3)
+    assert [buffer.append(v) for v in [1, 2, 3, 4, 5]] == [None, None, None, 1, 2]
+    assert [buffer[i] for i in range(3)] == [3, 4, 5]
+    assert buffer[-1] == 5
+    assert buffer.full
+
+
+def test_indicators_match_batch_functions():
+    rng = np.random.default_rng(3)
+    engine = IndicatorEngine()
+    values, closes, cpis = [], [], []
+
+    for step in range(400):
+        value = float(rng.integers(0, 101))
+        values.append(value)
+        engine.update_index(value, _classification(value))
+
+        #rounded closes so the "Stable" branch is hit as well
+        close = float(np.round(100 + rng.normal(0, 1)))
+        closes.append(close)
+        engine.update_stockmarket(close)
+
+        if step % 20 == 0:
+            cpi = 300 * (1 + rng.normal(0.003, 0.004))
+            cpis.append(cpi)
+            engine.update_cpi(cpi)
+
+        #the batch functions expect the newest row first
+        if len(values) >= 21:
+            window = values[-21:][::-1]
+            df_index = pd.DataFrame({'value': window,
+                                     'value_classification': [_classification(v) for v in window]})
+            assert engine.lt_trend == get_index_trend(df_index)
+
+        if len(closes) >= 25:
+            batch = get_montly_stockmarket_trend(pd.DataFrame({'Close': closes[-25:]}))
+            assert engine.stockmarket_trend == batch.iloc[0]['stockmarket']
+
+        if len(cpis) >= 2:
+            batch = get_inflation(pd.DataFrame({'value': cpis[-13:][::-1]})).iloc[0]
+            for key, value in engine.inflation.items():
+                assert value == batch[key]
+
+
+def test_recommendation_emitted_only_on_change():
+    engine = IndicatorEngine(trend_window=3, stable_days=2, stock_lookback=2, cpi_window=2)
+    engine.update_cpi(100.0)
+    engine.update_cpi(101.0)
+    engine.update_stockmarket(10.0)
+    engine.update_stockmarket(11.0)
+
+    #nothing is emitted until the F&G window is full
+    assert engine.update_index(20, "Fear") is None
+    assert engine.update_index(20, "Fear") is None
+    assert engine.update_index(20, "Fear") == "It's safe to buy!"
+
+    #same state
+    assert engine.update_index(21, "Fear") is None
+    #new state, same recommendation
+    assert engine.update_stockmarket(9.0) is None
+    assert engine.state == ("Fear", "Stable", "Falling", "High")
+
+    engine.update_index(80, "Greed")
+    assert engine.update_index(80, "Greed") == "Stop! Don't buy!"
+    assert engine.recommendation == "Stop! Don't buy!"
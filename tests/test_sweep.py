@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import sweep
+from functions import get_index_trend
+from stockmarket import get_montly_stockmarket_trend
+
+
+def _classification(value: float) -> str:
+    if value < 25:
+        return "Extreme Fear"
+    elif value < 45:
+        return "Fear"
+    elif value < 55:
+        return "Neutral"
+    elif value < 75:
+        return "Greed"
+    return "Extreme Greed"
+
+
+def _history(n: int = 400, seed: int = 1) -> dict:
+    rng = np.random.default_rng(seed)
+    #long runs of similar readings so both stable and unstable trends occur
+    fg = np.clip(np.repeat(rng.integers(0, 101, n // 10), 10) + rng.integers(-8, 9, n), 0, 100).astype(float)
+    classification = np.array([_classification(v) for v in fg])
+    stock_dates = pd.bdate_range('2020-01-01', periods=n * 5 // 7)
+    return {
+        'dates': pd.date_range('2020-01-01', periods=n).to_numpy(),
+        'fg_value': fg,
+        'fg_classification': classification,
+        'fg_fear': np.isin(classification, sweep.FEAR_CLASSES),
+        'fg_greed': np.isin(classification, sweep.GREED_CLASSES),
+        'crypto_close': 100 * np.exp(np.cumsum(rng.normal(0, 0.03, n))),
+        #whole numbers so the "Stable" branch is hit as well
+        'stock_close': np.round(100 + np.cumsum(rng.normal(0, 1, len(stock_dates)))),
+        'stock_dates': stock_dates.to_numpy(),
+        'inflation': rng.uniform(0, 8, n),
+    }
+
+
+def test_stock_rising_matches_monthly_trend():
+    history = _history()
+    sweep._init_worker(history)
+    codes = {"Rising": 1, "Stable": 0, "Falling": -1}
+
+    close = history['stock_close']
+    trend = pd.Series(sweep._stock_rising(25), index=history['dates'])
+    for i in range(24, len(close)):
+        batch = get_montly_stockmarket_trend(pd.DataFrame({'Close': close[:i + 1]}))
+        assert trend[history['stock_dates'][i]] == codes[batch.iloc[0]['stockmarket']]
+
+
+def test_band_count_matches_index_trend():
+    history = _history()
+    sweep._init_worker(history)
+    fear_count = sweep._band_count(0, 47, 21)
+    greed_count = sweep._band_count(55, 100, 21)
+
+    fg = history['fg_value']
+    for t in range(20, len(fg)):
+        #get_index_trend expects the newest reading first
+        window = fg[t - 20:t + 1][::-1]
+        df = pd.DataFrame({'value': window, 'value_classification': [_classification(v) for v in window]})
+        batch = get_index_trend(df)
+        if history['fg_fear'][t]:
+            assert batch == ("Stable" if fear_count[t] >= 18 else "Unstable")
+        elif history['fg_greed'][t]:
+            assert batch == ("Long-term trend is stable" if greed_count[t] >= 18
+                             else "Long-term trend is unstable")
+
+
+def test_run_sweep_ranks_every_grid_point():
+    grid = {
+        'trend_window': [14, 21],
+        'fear_upper': [45, 47],
+        'greed_lower': [55],
+        'stock_lookback': [1, 10, 25],
+        'stable_days': [12, 18],
+        'inflation_low': [2.0],
+        'inflation_high': [5.0],
+    }
+    points = sweep.get_grid(grid)
+    #stable_days above trend_window and lookbacks under 2 rows are skipped:
+    #window 14 keeps stable_days 12 only, window 21 keeps both, each with 2 fear bands and 2 lookbacks
+    assert len(points) == (1 + 2) * 2 * 2
+
+    df = sweep.run_sweep(_history(), grid=grid, workers=2)
+    assert len(df) == len(points)
+    assert list(df['sharpe']) == sorted(df['sharpe'], reverse=True)
+    names = list(grid)
+    assert sorted(map(tuple, df[names].to_numpy().tolist())) == sorted(tuple(p[n] for n in names) for p in points)
+
+
+def test_stock_lookback_under_two_rows_is_rejected():
+    sweep._init_worker(_history())
+    with pytest.raises(ValueError):
+        sweep._stock_rising(1)